@@ -1,8 +1,9 @@
 import argparse
+import dataclasses
 import json
 import logging
 
-from thoughtlocker.db import get_connection, ensure_schema
+from thoughtlocker.db import ensure_schema, scoped_connection
 from thoughtlocker.repository import PromptRepository
 
 
@@ -14,15 +15,14 @@ def main():
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
-    conn = get_connection(args.db)
-    ensure_schema(conn)
-    repo = PromptRepository(conn)
-    spec = repo.get_by_name(args.name)
+    with scoped_connection(args.db) as conn:
+        ensure_schema(conn)
+        spec = PromptRepository(conn).get_by_name(args.name)
     if spec is None:
         raise SystemExit(f"Prompt '{args.name}' not found")
 
     if args.json:
-        print(json.dumps(spec.__dict__, default=str, ensure_ascii=False, indent=2))
+        print(json.dumps(dataclasses.asdict(spec), default=str, ensure_ascii=False, indent=2))
     else:
         print(spec.system_instruction)
 
@@ -0,0 +1,62 @@
+import json
+import math
+from datetime import date, datetime, time, timezone
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+from thoughtlocker import models
+
+orjson = pytest.importorskip("orjson")
+
+
+class Tier(Enum):
+    LOW = "low"
+
+
+VALUES = [
+    {"since": date(2024, 1, 1), "x": float("nan")},
+    {"at": datetime(2024, 1, 1, 12, 30, 0, 5, tzinfo=timezone.utc), "t": time(1, 2, 3)},
+    {"naive": datetime(2024, 1, 1), "inf": [float("inf"), float("-inf"), 0.5, -0.0]},
+    {1: "int key", None: "none key", False: "bool key", 2.5: "float key"},
+    {"text": "naïve — 日本語", "escape": 'quote " and \\ and \n'},
+    {"id": UUID("12345678-1234-5678-1234-567812345678"), "tier": Tier.LOW},
+    {"nested": {"tuple": (1, 2), "list": [None, True, False, {}]}},
+    [],
+    "plain",
+    42,
+]
+
+
+@pytest.fixture
+def stdlib_dumps(monkeypatch):
+    def dumps(value):
+        monkeypatch.setattr(models, "orjson", None)
+        try:
+            return models._json_dumps(value)
+        finally:
+            monkeypatch.setattr(models, "orjson", orjson)
+
+    return dumps
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_json_dumps_matches_across_codecs(value, stdlib_dumps):
+    assert models._json_dumps(value) == stdlib_dumps(value)
+
+
+def test_json_dumps_date_and_nan():
+    assert models._json_dumps({"since": date(2024, 1, 1), "x": math.nan}) == (
+        '{"since":"2024-01-01","x":null}'
+    )
+
+
+@pytest.mark.parametrize("value", [1e16, 1e-7, 4.2e-05, 1.5e300])
+def test_json_dumps_floats_parse_the_same(value, stdlib_dumps):
+    # Exponent spelling differs between codecs (1e16 vs 1e+16); the values do not.
+    assert json.loads(models._json_dumps([value])) == json.loads(stdlib_dumps([value]))
+
+
+def test_json_dumps_big_int_falls_back_to_stdlib():
+    assert models._json_dumps({"n": 2**70}) == '{"n":%d}' % 2**70
@@ -1,5 +1,11 @@
 from .models import PromptSpec
-from .db import get_connection, ensure_schema
+from .db import (
+    get_connection,
+    release_connection,
+    scoped_connection,
+    ensure_schema,
+    close_connections,
+)
 from .repository import PromptRepository
 from .store import Locker
 
@@ -10,5 +16,8 @@ __all__ = [
     "PromptRepository",
     "Locker",
     "get_connection",
+    "release_connection",
+    "scoped_connection",
     "ensure_schema",
+    "close_connections",
 ]
@@ -1,29 +1,108 @@
 import os
 import logging
+import threading
 from contextlib import contextmanager
+from typing import Dict, Iterator, Set
 import duckdb
 
 logger = logging.getLogger(__name__)
 
+# One DuckDB database instance per file for the whole process; callers get cursors on it.
+_CONN_CACHE: Dict[str, duckdb.DuckDBPyConnection] = {}
+# Outstanding get_connection() users per cached database; it is closed when this drops to 0.
+_CONN_REFS: Dict[str, int] = {}
+# Database paths whose schema has already been ensured by this process.
+_SCHEMA_READY: Set[str] = set()
+_CONN_LOCK = threading.Lock()
+# Set once the fts extension failed to load and install, so later repositories don't
+# retry the download (e.g. offline) on every first search.
+_FTS_UNAVAILABLE = False
+
 
 def get_connection(db_path: str = "prompts.duckdb") -> duckdb.DuckDBPyConnection:
     """Return a DuckDB connection to the specified database path.
 
     Ensures that the parent directory exists and configures sensible pragmas.
+    The underlying database is opened once per process and cached; each call returns
+    a new cursor on it, so closing the result does not affect other callers. Each call
+    also takes a reference on the database: pair it with ``release_connection`` so the
+    file is released once its last user is done.
     """
     abs_path = os.path.abspath(db_path)
-    parent_dir = os.path.dirname(abs_path)
-    if parent_dir and not os.path.exists(parent_dir):
-        os.makedirs(parent_dir, exist_ok=True)
+    with _CONN_LOCK:
+        conn = _CONN_CACHE.get(abs_path)
+        if conn is None:
+            parent_dir = os.path.dirname(abs_path)
+            if parent_dir and not os.path.exists(parent_dir):
+                os.makedirs(parent_dir, exist_ok=True)
+
+            conn = duckdb.connect(abs_path)
+            conn.execute("PRAGMA threads=4;")
+            conn.execute("PRAGMA enable_progress_bar=false;")
+            _CONN_CACHE[abs_path] = conn
+        _CONN_REFS[abs_path] = _CONN_REFS.get(abs_path, 0) + 1
+        return conn.cursor()
+
+
+def release_connection(db_path: str = "prompts.duckdb") -> None:
+    """Drop a reference taken by ``get_connection``; the last one closes the database."""
+    abs_path = os.path.abspath(db_path)
+    with _CONN_LOCK:
+        refs = _CONN_REFS.get(abs_path, 0) - 1
+        if refs > 0:
+            _CONN_REFS[abs_path] = refs
+            return
+        _CONN_REFS.pop(abs_path, None)
+        _SCHEMA_READY.discard(abs_path)
+        conn = _CONN_CACHE.pop(abs_path, None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception as exc:
+            logger.warning("Error closing DuckDB connection to %s: %s", abs_path, exc)
+
+
+@contextmanager
+def scoped_connection(db_path: str = "prompts.duckdb") -> Iterator[duckdb.DuckDBPyConnection]:
+    """Yield a cursor from ``get_connection``; close and release it on exit.
+
+    The database file is released on exit unless another user (e.g. a ``Locker``) still
+    holds it, so one-off callers such as the seeding CLI don't keep it locked.
+    """
+    conn = get_connection(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+        release_connection(db_path)
+
+
+def close_connections() -> None:
+    """Close all cached database instances, releasing their file locks.
 
-    conn = duckdb.connect(abs_path)
-    conn.execute("PRAGMA threads=4;")
-    conn.execute("PRAGMA enable_progress_bar=false;")
-    return conn
+    This invalidates every outstanding cursor, including those held by open ``Locker``s.
+    """
+    with _CONN_LOCK:
+        for abs_path, conn in _CONN_CACHE.items():
+            try:
+                conn.close()
+            except Exception as exc:
+                logger.warning("Error closing DuckDB connection to %s: %s", abs_path, exc)
+        _CONN_CACHE.clear()
+        _CONN_REFS.clear()
+        _SCHEMA_READY.clear()
 
 
 def ensure_schema(conn: duckdb.DuckDBPyConnection) -> None:
-    """Create tables and indices if they don't exist."""
+    """Create tables and indices if they don't exist.
+
+    Runs at most once per database file per process; in-memory databases are always checked.
+    """
+    db_path = conn.execute(
+        "SELECT path FROM duckdb_databases() WHERE database_name = current_database();"
+    ).fetchone()[0]
+    if db_path is not None and db_path in _SCHEMA_READY:
+        return
     logger.debug("Ensuring DuckDB schema for prompt specs")
     conn.execute(
         """
@@ -53,9 +132,12 @@ def ensure_schema(conn: duckdb.DuckDBPyConnection) -> None:
         );
         """
     )
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_prompt_specs_provider ON prompt_specs(provider);")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_prompt_specs_model ON prompt_specs(model);")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_prompt_specs_enabled ON prompt_specs(enabled);")
+    # Filters on provider/model/enabled are served by DuckDB's vectorized scans; secondary
+    # ART indexes on these low-cardinality columns only add write cost. Drop them from
+    # databases created by earlier versions.
+    conn.execute("DROP INDEX IF EXISTS idx_prompt_specs_provider;")
+    conn.execute("DROP INDEX IF EXISTS idx_prompt_specs_model;")
+    conn.execute("DROP INDEX IF EXISTS idx_prompt_specs_enabled;")
 
     # Append-only version history table for prompt specs
     conn.execute(
@@ -93,6 +175,85 @@ def ensure_schema(conn: duckdb.DuckDBPyConnection) -> None:
     conn.execute("CREATE INDEX IF NOT EXISTS idx_psv_name ON prompt_spec_versions(name);")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_psv_name_updated ON prompt_spec_versions(name, updated_at);")
 
+    # Per-name version counters so recording a version is a primary-key probe
+    # rather than a MAX(version_seq) aggregation over the history table.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS prompt_spec_counters (
+            name TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL
+        );
+        """
+    )
+    # Backfill counters for histories recorded before the counters table existed.
+    conn.execute(
+        """
+        INSERT INTO prompt_spec_counters (name, seq)
+        SELECT name, MAX(version_seq) FROM prompt_spec_versions
+        WHERE name NOT IN (SELECT name FROM prompt_spec_counters)
+        GROUP BY name;
+        """
+    )
+
+    # Alias -> name lookup table so alias resolution is a primary-key probe instead
+    # of a list_contains scan over prompt_specs. Kept in sync by PromptRepository.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS prompt_aliases (
+            alias TEXT PRIMARY KEY,
+            name TEXT NOT NULL
+        );
+        """
+    )
+    # Populate the alias table for databases created before it existed.
+    conn.execute(
+        """
+        INSERT INTO prompt_aliases (alias, name)
+        SELECT DISTINCT ON (alias) alias, name
+        FROM (SELECT unnest(aliases) AS alias, name FROM prompt_specs)
+        WHERE alias IS NOT NULL AND NOT EXISTS (SELECT 1 FROM prompt_aliases)
+        ORDER BY alias, name;
+        """
+    )
+
+    # prompt_specs state the full-text index was last built at; see PromptRepository.search.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS prompt_fts_state (
+            row_count BIGINT,
+            max_updated_at TIMESTAMP,
+            revision BIGINT
+        );
+        """
+    )
+
+    if db_path is not None:
+        _SCHEMA_READY.add(db_path)
+
+
+def load_fts(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Load DuckDB's full-text search extension, installing it on first use.
+
+    Returns False when the extension cannot be loaded (e.g. offline without a cached copy);
+    after the first such failure, later calls in this process return False immediately.
+    """
+    global _FTS_UNAVAILABLE
+    if _FTS_UNAVAILABLE:
+        return False
+    try:
+        conn.execute("LOAD fts;")
+        return True
+    except duckdb.Error:
+        pass
+    try:
+        conn.execute("INSTALL fts;")
+        conn.execute("LOAD fts;")
+        return True
+    except duckdb.Error as exc:
+        logger.info("DuckDB fts extension unavailable, text search falls back to LIKE: %s", exc)
+        _FTS_UNAVAILABLE = True
+        return False
+
 
 @contextmanager
 def transaction(conn: duckdb.DuckDBPyConnection):
@@ -105,5 +266,3 @@ def transaction(conn: duckdb.DuckDBPyConnection):
         logger.exception("Transaction failed, rolling back: %s", exc)
         conn.execute("ROLLBACK;")
         raise
-
-
@@ -1,17 +1,21 @@
 import argparse
 import hashlib
-import json
 import logging
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Tuple
 
+import duckdb
 import yaml
 
-from .db import get_connection, ensure_schema, transaction
+from .db import ensure_schema, scoped_connection, transaction
 from .models import PromptSpec
 from .repository import PromptRepository
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed loader when PyYAML was built against it.
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 REQUIRED_FIELDS = [
     "description",
     "provider",
@@ -24,85 +28,164 @@ REQUIRED_FIELDS = [
     "system_instruction",
 ]
 
+OPTIONAL_FIELDS = [
+    "use_cases",
+    "parameters",
+    "tags",
+    "version",
+    "enabled",
+    "aliases",
+    "source",
+    "token_limits",
+    "notes",
+]
 
-def _compute_checksum(payload: Dict) -> str:
-    normalized = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+# The checksum covers every persisted field, so any YAML edit is detected as a change.
+CHECKSUM_FIELDS = REQUIRED_FIELDS + OPTIONAL_FIELDS
+
+
+def _text_bytes(text: str) -> bytes:
+    """Length-prefixed UTF-8, so separator bytes inside the text can't shift boundaries."""
+    data = text.encode("utf-8")
+    return str(len(data)).encode("ascii") + b":" + data
+
+
+# Field names are encoded once; each checksum is a single sha256 call over one buffer.
+_FIELD_KEYS = [_text_bytes(field) for field in CHECKSUM_FIELDS]
+
+
+def _canonical_bytes(value: Any) -> bytes:
+    """Return a canonical, type-tagged byte form of ``value`` (sorted keys for mappings).
+
+    Each value starts with a one-byte type tag, so e.g. ``None``/``""`` and ``1``/``"1"``
+    encode differently; strings and containers are length-prefixed.
+    """
+    if value is None:
+        return b"N"
+    if isinstance(value, bool):
+        return b"T" if value else b"F"
+    if isinstance(value, int):
+        return b"i" + str(value).encode("ascii") + b";"
+    if isinstance(value, float):
+        return b"f" + repr(value).encode("ascii") + b";"
+    if isinstance(value, str):
+        return b"s" + _text_bytes(value)
+    if isinstance(value, (bytes, bytearray)):
+        return b"b" + str(len(value)).encode("ascii") + b":" + bytes(value)
+    if isinstance(value, dict):
+        keys = sorted(value, key=lambda key: (str(key), type(key).__name__))
+        return (
+            b"d"
+            + str(len(keys)).encode("ascii")
+            + b":"
+            + b"".join(_canonical_bytes(key) + _canonical_bytes(value[key]) for key in keys)
+        )
+    if isinstance(value, (list, tuple)):
+        return (
+            b"l"
+            + str(len(value)).encode("ascii")
+            + b":"
+            + b"".join(_canonical_bytes(item) for item in value)
+        )
+    # Other YAML scalars (dates, timestamps) keep their type name alongside their text.
+    return b"o" + _text_bytes(type(value).__name__) + _text_bytes(str(value))
+
+
+def _compute_checksum(data: Dict) -> str:
+    buf = b"".join(
+        key + _canonical_bytes(data.get(field)) for field, key in zip(CHECKSUM_FIELDS, _FIELD_KEYS)
+    )
+    return hashlib.sha256(buf).hexdigest()
 
 
 def _validate_and_build(name: str, data: Dict) -> PromptSpec:
     for field in REQUIRED_FIELDS:
         if field not in data:
             raise ValueError(f"Prompt '{name}' missing required field: {field}")
-    metadata_for_checksum = {k: data.get(k) for k in REQUIRED_FIELDS}
-    checksum = _compute_checksum(metadata_for_checksum)
-    return PromptSpec(
-        name=name,
-        description=data.get("description"),
-        provider=data.get("provider"),
-        model=data.get("model"),
-        web_search=data.get("web_search"),
-        reasoning_effort=data.get("reasoning_effort"),
-        context_size=data.get("context_size"),
-        temperature=data.get("temperature"),
-        max_output_tokens=data.get("max_output_tokens"),
-        system_instruction=data.get("system_instruction") or "",
-        use_cases=data.get("use_cases"),
-        parameters=data.get("parameters"),
-        tags=data.get("tags"),
-        version=data.get("version"),
-        enabled=data.get("enabled", True),
-        aliases=data.get("aliases"),
-        source=data.get("source"),
-        checksum=checksum,
-        token_limits=data.get("token_limits"),
-        notes=data.get("notes"),
-    )
+    values = {field: data.get(field) for field in CHECKSUM_FIELDS}
+    values["system_instruction"] = values["system_instruction"] or ""
+    values["enabled"] = data.get("enabled", True)
+    # Hash the values as they will be stored, so equivalent spellings don't count as edits.
+    return PromptSpec(name=name, checksum=_compute_checksum(values), **values)
 
 
-def load_yaml_to_specs(yaml_path: str) -> List[PromptSpec]:
+def load_yaml_to_specs(yaml_path: str) -> Iterator[PromptSpec]:
+    """Lazily parse prompt specs from YAML.
+
+    The file may be a single mapping of name -> spec, or a stream of such mappings
+    separated by ``---`` (e.g. one document per prompt). Documents are parsed one at
+    a time, so peak memory is bounded by the largest document rather than the file.
+    """
     with open(yaml_path, "r", encoding="utf-8") as f:
-        content = yaml.safe_load(f)
-    if not isinstance(content, dict):
-        raise ValueError("YAML root must be a mapping of name -> spec")
-    specs: List[PromptSpec] = []
-    for name, data in content.items():
-        if not isinstance(data, dict):
-            raise ValueError(f"Entry '{name}' must be a mapping of fields")
-        spec = _validate_and_build(name, data)
-        specs.append(spec)
-    return specs
-
-
-def seed_from_yaml(db_path: str, yaml_path: str) -> Tuple[int, int]:
-    conn = get_connection(db_path)
-    ensure_schema(conn)
-    repo = PromptRepository(conn)
-    created = 0
-    updated = 0
+        for content in yaml.load_all(f, Loader=Loader):
+            if content is None:
+                continue
+            if not isinstance(content, dict):
+                raise ValueError("YAML root must be a mapping of name -> spec")
+            for name, data in content.items():
+                if not isinstance(data, dict):
+                    raise ValueError(f"Entry '{name}' must be a mapping of fields")
+                yield _validate_and_build(name, data)
+
+
+def iter_changed_specs(repo: PromptRepository, specs: Iterable[PromptSpec]) -> Iterator[PromptSpec]:
+    """Lazily drop specs whose checksum matches the stored one, using a single checksum query."""
+    existing = repo.checksums()
+    for spec in specs:
+        if spec.checksum is not None and existing.get(spec.name) == spec.checksum:
+            logger.info("No change for '%s'", spec.name)
+            continue
+        # Track what will be stored so a later duplicate entry is compared against it.
+        existing[spec.name] = spec.checksum
+        yield spec
+
+
+def seed_specs(
+    conn: duckdb.DuckDBPyConnection,
+    repo: PromptRepository,
+    specs: Iterable[PromptSpec],
+    batch_size: int = 256,
+) -> Tuple[int, int]:
+    """Upsert changed specs in batches of ``batch_size`` inside one transaction.
+
+    Specs are consumed lazily, so parsing overlaps with writing and at most one batch
+    is held in memory. No transaction is opened when nothing changed.
+    Returns (created, updated).
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    changed = iter_changed_specs(repo, specs)
+    batch = list(islice(changed, batch_size))
+    if not batch:
+        return 0, 0
+    created = updated = 0
     with transaction(conn):
-        for spec in load_yaml_to_specs(yaml_path):
-            existing = repo.get_by_name(spec.name)
-            if existing is None:
-                repo.upsert(spec)
-                created += 1
-            else:
-                if existing.checksum != spec.checksum:
-                    repo.upsert(spec)
-                    updated += 1
-                else:
-                    logger.info("No change for '%s'", spec.name)
+        while batch:
+            batch_created, batch_updated = repo.upsert_many(batch)
+            created += batch_created
+            updated += batch_updated
+            batch = list(islice(changed, batch_size))
     return created, updated
 
 
+def seed_from_yaml(db_path: str, yaml_path: str, batch_size: int = 256) -> Tuple[int, int]:
+    with scoped_connection(db_path) as conn:
+        ensure_schema(conn)
+        repo = PromptRepository(conn)
+        return seed_specs(conn, repo, load_yaml_to_specs(yaml_path), batch_size=batch_size)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Seed DuckDB prompt specs from YAML")
     parser.add_argument("--db", required=True, help="Absolute path to DuckDB database file")
     parser.add_argument("--yaml", required=True, help="Path to prompts YAML")
+    parser.add_argument(
+        "--batch-size", type=int, default=256, help="Number of specs written per bulk upsert"
+    )
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
-    created, updated = seed_from_yaml(args.db, args.yaml)
+    created, updated = seed_from_yaml(args.db, args.yaml, batch_size=args.batch_size)
     logger.info("Seeding complete. created=%d updated=%d", created, updated)
 
 
@@ -1,9 +1,70 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import math
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+try:  # Optional fast JSON codec; stdlib json is used when it isn't installed.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_default(value: Any) -> Any:
+    # Shared by both codecs so dates and times are spelled the same either way.
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_safe(value: Any) -> Any:
+    """Rewrite ``value`` into what stdlib json encodes the way orjson does."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (str, int)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {_json_key(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return _json_safe(value.value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _json_safe(getattr(value, f.name)) for f in fields(value)}
+    return _json_default(value)
+
+
+def _json_key(key: Any) -> Any:
+    if isinstance(key, (str, int, float)) or key is None:
+        return key
+    return _json_safe(key)
+
+
+def _json_dumps(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode("utf-8")
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) go through stdlib json.
+            pass
+    # Compact, UTF-8 and NaN/Infinity as null, matching orjson's output.
+    return json.dumps(_json_safe(value), separators=(",", ":"), ensure_ascii=False, allow_nan=False)
 
 
 def _json_to_obj(value: Any):
@@ -13,13 +74,79 @@ def _json_to_obj(value: Any):
         return value
     if isinstance(value, str):
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return _json_loads(value)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
             return {"raw": value}
     return None
 
 
-@dataclass
+class _RawJSON(str):
+    """JSON text read from a DuckDB JSON column and not parsed yet."""
+
+    __slots__ = ()
+
+
+def _raw_json(value: Any) -> Any:
+    # Only text known to come from the database is treated as unparsed JSON; any other
+    # str assigned to a JSON field is a value to be serialized like dicts and lists.
+    return _RawJSON(value) if isinstance(value, str) else value
+
+
+class _LazyJSON:
+    """Descriptor that defers ``json.loads`` of stored JSON text until first access.
+
+    Rows read from DuckDB carry JSON columns as strings; most callers only need
+    ``system_instruction``, so parsing is postponed and the result cached in the
+    field's underlying slot.
+    """
+
+    def __init__(self, slot) -> None:
+        self._slot = slot
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self._slot.__get__(obj, objtype)
+        if isinstance(value, _RawJSON):
+            # orjson only accepts exact str instances.
+            value = _json_to_obj(str(value))
+            self._slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value) -> None:
+        self._slot.__set__(obj, value)
+
+    def raw(self, obj):
+        """Return the stored value without parsing it."""
+        return self._slot.__get__(obj, type(obj))
+
+
+def _to_json_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    # JSON text read from DuckDB and never accessed is written back as-is.
+    if isinstance(value, _RawJSON):
+        return str(value)
+    return _json_dumps(value)
+
+
+def _lazy_json(*names: str):
+    """Class decorator wrapping the slots of the given dataclass fields in ``_LazyJSON``."""
+
+    def wrap(cls):
+        for name in names:
+            setattr(cls, name, _LazyJSON(cls.__dict__[name]))
+        return cls
+
+    return wrap
+
+
+# Columns stored as DuckDB JSON.
+JSON_FIELDS = ("parameters", "token_limits")
+
+
+@_lazy_json(*JSON_FIELDS)
+@dataclass(slots=True)
 class PromptSpec:
     name: str
     description: Optional[str]
@@ -58,41 +185,60 @@ class PromptSpec:
             max_output_tokens=row.get("max_output_tokens"),
             system_instruction=row.get("system_instruction") or "",
             use_cases=row.get("use_cases"),
-            parameters=_json_to_obj(row.get("parameters")),
+            parameters=_raw_json(row.get("parameters")),
             tags=row.get("tags"),
             version=row.get("version"),
             enabled=row.get("enabled", True),
             aliases=row.get("aliases"),
             source=row.get("source"),
             checksum=row.get("checksum"),
-            token_limits=_json_to_obj(row.get("token_limits")),
+            token_limits=_raw_json(row.get("token_limits")),
             notes=row.get("notes"),
             created_at=row.get("created_at"),
             updated_at=row.get("updated_at"),
         )
 
+    @classmethod
+    def _from_row_tuple(cls, row: Sequence[Any]) -> "PromptSpec":
+        """Build a spec from a row selected in field order (see ``SPEC_FIELDS``)."""
+        spec = cls(*row)
+        if spec.system_instruction is None:
+            spec.system_instruction = ""
+        for name in JSON_FIELDS:
+            descriptor = cls.__dict__[name]
+            descriptor.__set__(spec, _raw_json(descriptor.raw(spec)))
+        return spec
+
+    def to_db_row(self) -> Tuple[Any, ...]:
+        """Writable column values in ``WRITE_FIELDS`` order, for positional/bulk inserts."""
+        return (
+            self.name,
+            self.description,
+            self.provider,
+            self.model,
+            self.web_search,
+            self.reasoning_effort,
+            self.context_size,
+            self.temperature,
+            self.max_output_tokens,
+            self.system_instruction,
+            self.use_cases,
+            _to_json_text(PromptSpec.parameters.raw(self)),
+            self.tags,
+            self.version,
+            self.enabled,
+            self.aliases,
+            self.source,
+            self.checksum,
+            _to_json_text(PromptSpec.token_limits.raw(self)),
+            self.notes,
+        )
+
     def to_db_params(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "description": self.description,
-            "provider": self.provider,
-            "model": self.model,
-            "web_search": self.web_search,
-            "reasoning_effort": self.reasoning_effort,
-            "context_size": self.context_size,
-            "temperature": self.temperature,
-            "max_output_tokens": self.max_output_tokens,
-            "system_instruction": self.system_instruction,
-            "use_cases": self.use_cases,
-            "parameters": None if self.parameters is None else json.dumps(self.parameters),
-            "tags": self.tags,
-            "version": self.version,
-            "enabled": self.enabled,
-            "aliases": self.aliases,
-            "source": self.source,
-            "checksum": self.checksum,
-            "token_limits": None if self.token_limits is None else json.dumps(self.token_limits),
-            "notes": self.notes,
-        }
+        return dict(zip(WRITE_FIELDS, self.to_db_row()))
 
 
+# Column names in PromptSpec field order, matching the prompt_specs table.
+SPEC_FIELDS = tuple(f.name for f in fields(PromptSpec))
+# Columns written on insert/update; timestamps are managed by the database.
+WRITE_FIELDS = tuple(f for f in SPEC_FIELDS if f not in ("created_at", "updated_at"))
@@ -1,153 +1,441 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import duckdb
 
-from .models import PromptSpec
+if TYPE_CHECKING:
+    import pyarrow
+
+from .db import load_fts
+from .models import JSON_FIELDS, SPEC_FIELDS, WRITE_FIELDS, PromptSpec, _json_to_obj
 
 logger = logging.getLogger(__name__)
 
+# Explicit projection in PromptSpec field order, so rows map positionally onto the dataclass.
+_SPEC_SELECT = ", ".join(SPEC_FIELDS)
+
+# Bulk counterpart of the checksum reset in PromptRepository.upsert.
+_CHECKSUM_ASSIGNMENT = (
+    "checksum = CASE WHEN excluded.checksum IS NOT DISTINCT FROM prompt_specs.checksum "
+    "THEN NULL ELSE excluded.checksum END"
+)
+
+# Moves each dropped alias selected by the {dropped} predicate over prompt_aliases to the
+# most recently written other prompt that still lists it; the candidates are computed once.
+_REPOINT_ALIASES = """
+    UPDATE prompt_aliases SET name = o.name
+    FROM (
+        SELECT DISTINCT ON (d.alias) d.alias, p.name
+        FROM (SELECT alias, name AS owner FROM prompt_aliases WHERE {dropped}) d
+        JOIN prompt_specs p
+          ON p.name <> d.owner AND coalesce(list_contains(p.aliases, d.alias), FALSE)
+        ORDER BY d.alias, p.updated_at DESC, p.name
+    ) o
+    WHERE prompt_aliases.alias = o.alias;
+"""
+
+
+_CHECKSUM_AT = WRITE_FIELDS.index("checksum")
+_ALIASES_AT = WRITE_FIELDS.index("aliases")
+_SPEC_ALIASES_AT = SPEC_FIELDS.index("aliases")
+_JSON_AT = frozenset(WRITE_FIELDS.index(c) for c in JSON_FIELDS)
+
+
+def _row_differs(stored: Sequence[Any], row: Sequence[Any]) -> bool:
+    """Whether ``row`` (``WRITE_FIELDS`` order) changes any column of the stored row."""
+    for i, new in enumerate(row):
+        old = stored[i]
+        if i in _JSON_AT:
+            # Compare parsed JSON, so formatting differences alone don't count as changes.
+            old, new = _json_to_obj(old), _json_to_obj(new)
+        elif isinstance(new, tuple):
+            new = list(new)
+        if old != new:
+            return True
+    return False
+
+
+def _row_changed(old: str, new: str) -> str:
+    """SQL predicate that is true when any written column differs between two row aliases."""
+    # JSON is compared minified, so formatting differences alone don't count as changes.
+    return " OR ".join(
+        f"json({old}.{c}) IS DISTINCT FROM json({new}.{c})"
+        if c in JSON_FIELDS
+        else f"{old}.{c} IS DISTINCT FROM {new}.{c}"
+        for c in WRITE_FIELDS
+        if c != "name"
+    )
+
 
 class PromptRepository:
     def __init__(self, conn: duckdb.DuckDBPyConnection):
         self.conn = conn
+        # The fts index is a static snapshot; it is rebuilt on the next text search once
+        # the database no longer matches the state recorded in prompt_fts_state.
+        self._fts_available: Optional[bool] = None
+        # Parse hot-path statements once; DuckDB re-parses plain SQL strings on every execute.
+        # Single-row writes probe the stored row by primary key (_ps_get), then run a
+        # targeted INSERT or UPDATE.
+        self._ps_insert = self._prepare(
+            f"""
+            INSERT INTO prompt_specs (
+                name, description, provider, model, web_search, reasoning_effort, context_size,
+                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
+                version, enabled, aliases, source, checksum, token_limits, notes
+            ) VALUES (
+                $name, $description, $provider, $model, $web_search, $reasoning_effort, $context_size,
+                $temperature, $max_output_tokens, $system_instruction, $use_cases, $parameters, $tags,
+                $version, $enabled, $aliases, $source, $checksum, $token_limits, $notes
+            );
+            """
+        )
+        self._ps_update = self._prepare(
+            f"""
+            UPDATE prompt_specs SET
+                description = $description,
+                provider = $provider,
+                model = $model,
+                web_search = $web_search,
+                reasoning_effort = $reasoning_effort,
+                context_size = $context_size,
+                temperature = $temperature,
+                max_output_tokens = $max_output_tokens,
+                system_instruction = $system_instruction,
+                use_cases = $use_cases,
+                parameters = $parameters,
+                tags = $tags,
+                version = $version,
+                enabled = $enabled,
+                aliases = $aliases,
+                source = $source,
+                checksum = $checksum,
+                token_limits = $token_limits,
+                notes = $notes,
+                updated_at = now()
+            WHERE name = $name;
+            """
+        )
+        self._ps_bump_seq = self._prepare(
+            "UPDATE prompt_spec_counters SET seq = seq + 1 WHERE name = $name RETURNING seq;"
+        )
+        self._ps_first_seq = self._prepare(
+            "INSERT INTO prompt_spec_counters (name, seq) VALUES ($name, 1) RETURNING seq;"
+        )
+        # Copying the just-written row with INSERT ... SELECT measured faster than binding a
+        # RETURNING snapshot back in as parameters.
+        self._ps_insert_version = self._prepare(
+            """
+            INSERT INTO prompt_spec_versions (
+                name, version_seq, action,
+                description, provider, model, web_search, reasoning_effort, context_size,
+                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
+                version, enabled, aliases, source, checksum, token_limits, notes,
+                created_at, updated_at, occurred_at
+            )
+            SELECT
+                name, $version_seq, $action,
+                description, provider, model, web_search, reasoning_effort, context_size,
+                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
+                version, enabled, aliases, source, checksum, token_limits, notes,
+                created_at, updated_at, current_timestamp
+            FROM prompt_specs
+            WHERE name = $name;
+            """
+        )
+        self._ps_get = self._prepare(f"SELECT {_SPEC_SELECT} FROM prompt_specs WHERE name = $name;")
+        # Alias resolution returns a name, fetched afterwards by primary key (see _lookup).
+        # Kept to a single-table query, so it is answered from the alias primary key.
+        self._ps_alias_target = self._prepare("SELECT name FROM prompt_aliases WHERE alias = $name;")
+        self._ps_alias_scan = self._prepare(
+            """
+            SELECT name FROM prompt_specs
+            WHERE coalesce(list_contains(aliases, $name), FALSE)
+            ORDER BY updated_at DESC, name
+            LIMIT 1;
+            """
+        )
+        self._ps_instruction = self._prepare(
+            "SELECT system_instruction, aliases FROM prompt_specs WHERE name = $name;"
+        )
+        # An alias dropped by its owner moves to the most recently written prompt that
+        # still lists it; only aliases no prompt lists any more are deleted.
+        self._ps_repoint_aliases = self._prepare(
+            _REPOINT_ALIASES.format(
+                dropped="name = $name AND NOT coalesce(list_contains($aliases::VARCHAR[], alias), FALSE)"
+            )
+        )
+        self._ps_prune_aliases = self._prepare(
+            """
+            DELETE FROM prompt_aliases
+            WHERE name = $name AND NOT coalesce(list_contains($aliases::VARCHAR[], alias), FALSE);
+            """
+        )
+        self._ps_add_aliases = self._prepare(
+            """
+            INSERT INTO prompt_aliases (alias, name)
+            SELECT DISTINCT alias, $name
+            FROM (SELECT unnest($aliases::VARCHAR[]) AS alias)
+            WHERE alias IS NOT NULL
+            ON CONFLICT (alias) DO UPDATE SET name = excluded.name;
+            """
+        )
+        # Every write through either upsert path bumps a per-name version counter, so their
+        # sum is a revision number that changes with each committed write, regardless of
+        # transaction timestamps. Row count and latest updated_at also catch plain SQL edits.
+        self._ps_fts_source_state = self._prepare(
+            """
+            SELECT
+                (SELECT count(*) FROM prompt_specs),
+                (SELECT max(updated_at) FROM prompt_specs),
+                (SELECT coalesce(sum(seq), 0) FROM prompt_spec_counters);
+            """
+        )
+        self._ps_fts_built_state = self._prepare(
+            "SELECT row_count, max_updated_at, revision FROM prompt_fts_state;"
+        )
+        self._ps_checksums = self._prepare("SELECT name, checksum FROM prompt_specs;")
+        self._ps_list = self._prepare(f"SELECT {_SPEC_SELECT} FROM prompt_specs ORDER BY name;")
+        self._ps_list_enabled = self._prepare(
+            f"SELECT {_SPEC_SELECT} FROM prompt_specs WHERE enabled = $enabled ORDER BY name;"
+        )
+
+    def _prepare(self, sql: str) -> duckdb.Statement:
+        return self.conn.extract_statements(sql)[0]
 
     def upsert(self, spec: PromptSpec) -> None:
         """
         Insert or update a prompt spec by name, preserving created_at when updating.
+
+        Existing rows are only rewritten when at least one written column differs.
         """
-        row = self._get_row(spec.name)
-        params = spec.to_db_params()
-        if row is None:
-            logger.info("Inserting new prompt spec: %s", spec.name)
-            self.conn.execute(
-                """
-                INSERT INTO prompt_specs (
-                    name, description, provider, model, web_search, reasoning_effort, context_size,
-                    temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
-                    version, enabled, aliases, source, checksum, token_limits, notes
-                ) VALUES (
-                    $name, $description, $provider, $model, $web_search, $reasoning_effort, $context_size,
-                    $temperature, $max_output_tokens, $system_instruction, $use_cases, $parameters, $tags,
-                    $version, $enabled, $aliases, $source, $checksum, $token_limits, $notes
-                );
-                """,
-                params,
-            )
+        # One primary-key probe decides insert vs. update (timestamps can't: now() is fixed
+        # per transaction) and whether anything changed, without a wide SQL predicate.
+        stored = self.conn.execute(self._ps_get, {"name": spec.name}).fetchone()
+        row = spec.to_db_row()
+        exists = stored is not None
+        if exists:
+            if not _row_differs(stored, row):
+                logger.info("No change for '%s'", spec.name)
+                return
+            if spec.checksum is not None and spec.checksum == stored[_CHECKSUM_AT]:
+                # A changed row that kept its stored checksum (e.g. a copy of a fetched spec)
+                # no longer matches it, so clear it rather than let it mask later edits.
+                row = row[:_CHECKSUM_AT] + (None,) + row[_CHECKSUM_AT + 1 :]
+        params = dict(zip(WRITE_FIELDS, row))
+        self.conn.execute(self._ps_update if exists else self._ps_insert, params)
+        aliases = params["aliases"]
+        if aliases != (stored[_ALIASES_AT] if exists else None):
+            alias_params = {"name": spec.name, "aliases": aliases}
+            if exists:
+                self.conn.execute(self._ps_repoint_aliases, alias_params)
+                self.conn.execute(self._ps_prune_aliases, alias_params)
+            self.conn.execute(self._ps_add_aliases, alias_params)
+        if not exists:
+            logger.info("Inserted new prompt spec: %s", spec.name)
             self._insert_version_row(spec.name, action="insert")
         else:
-            logger.info("Updating existing prompt spec: %s", spec.name)
-            self.conn.execute(
-                """
-                UPDATE prompt_specs SET
-                    description = $description,
-                    provider = $provider,
-                    model = $model,
-                    web_search = $web_search,
-                    reasoning_effort = $reasoning_effort,
-                    context_size = $context_size,
-                    temperature = $temperature,
-                    max_output_tokens = $max_output_tokens,
-                    system_instruction = $system_instruction,
-                    use_cases = $use_cases,
-                    parameters = $parameters,
-                    tags = $tags,
-                    version = $version,
-                    enabled = $enabled,
-                    aliases = $aliases,
-                    source = $source,
-                    checksum = $checksum,
-                    token_limits = $token_limits,
-                    notes = $notes,
-                    updated_at = current_timestamp
-                WHERE name = $name;
-                """,
-                params,
-            )
+            logger.info("Updated existing prompt spec: %s", spec.name)
             self._insert_version_row(spec.name, action="update")
 
-    def _get_row(self, name: str) -> Optional[Dict[str, Any]]:
-        cur = self.conn.execute(
-            "SELECT * FROM prompt_specs WHERE name = $name LIMIT 1;",
-            {"name": name},
+    def upsert_many(self, specs: Iterable[PromptSpec]) -> Tuple[int, int]:
+        """
+        Bulk insert or update prompt specs, skipping rows identical to the stored ones.
+
+        Specs are staged into a temporary table with a single executemany, then
+        merged into prompt_specs and snapshotted into prompt_spec_versions with a
+        constant number of statements. Returns (created, updated).
+        """
+        # Keyed by name so a spec repeated later in the input wins, as with duplicate YAML keys;
+        # re-inserting moves it to its last position, which decides contested aliases below.
+        by_name = {}
+        for spec in specs:
+            by_name.pop(spec.name, None)
+            by_name[spec.name] = spec.to_db_row()
+        rows = [(*row, position) for position, row in enumerate(by_name.values())]
+        if not rows:
+            return 0, 0
+        columns = ", ".join(WRITE_FIELDS)
+        placeholders = ", ".join("?" for _ in range(len(WRITE_FIELDS) + 1))
+        assignments = ",\n                    ".join(
+            f"{c} = excluded.{c}" for c in WRITE_FIELDS if c not in ("name", "checksum")
         )
-        res = cur.fetchone()
-        if res is None:
-            return None
-        col_names = [d[0] for d in cur.description]
-        return {k: v for k, v in zip(col_names, res)}
+
+        self.conn.execute(
+            f"CREATE OR REPLACE TEMP TABLE incoming_specs AS SELECT {columns}, 0 AS position FROM prompt_specs WHERE FALSE;"
+        )
+        self.conn.executemany(f"INSERT INTO incoming_specs VALUES ({placeholders});", rows)
+        # Classify each incoming spec once by comparing every written column; unchanged
+        # specs never reach the write path.
+        self.conn.execute(
+            f"""
+            CREATE OR REPLACE TEMP TABLE incoming_changes AS
+            SELECT i.name, CASE WHEN p.name IS NULL THEN 'insert' ELSE 'update' END AS action
+            FROM incoming_specs i
+            LEFT JOIN prompt_specs p USING (name)
+            WHERE p.name IS NULL OR {_row_changed("p", "i")};
+            """
+        )
+        self.conn.execute(
+            f"""
+            INSERT INTO prompt_specs ({columns})
+            SELECT {columns} FROM incoming_specs
+            WHERE name IN (SELECT name FROM incoming_changes)
+            ON CONFLICT (name) DO UPDATE SET
+                    {assignments},
+                    {_CHECKSUM_ASSIGNMENT},
+                    updated_at = now();
+            """
+        )
+        # Aliases dropped by a changed spec move to another prompt still listing them, if any.
+        dropped_alias = """
+            name IN (SELECT name FROM incoming_changes)
+            AND NOT coalesce(
+                list_contains(
+                    (SELECT p.aliases FROM prompt_specs p WHERE p.name = prompt_aliases.name), alias
+                ),
+                FALSE
+            )
+        """
+        self.conn.execute(_REPOINT_ALIASES.format(dropped=dropped_alias))
+        self.conn.execute(f"DELETE FROM prompt_aliases WHERE {dropped_alias};")
+        self.conn.execute(
+            """
+            INSERT INTO prompt_aliases (alias, name)
+            SELECT DISTINCT ON (alias) alias, name
+            FROM (
+                SELECT unnest(p.aliases) AS alias, p.name, i.position
+                FROM prompt_specs p JOIN incoming_specs i USING (name)
+                WHERE p.name IN (SELECT name FROM incoming_changes)
+            )
+            WHERE alias IS NOT NULL
+            ORDER BY alias, position DESC
+            ON CONFLICT (alias) DO UPDATE SET name = excluded.name;
+            """
+        )
+        self.conn.execute(
+            """
+            INSERT INTO prompt_spec_counters (name, seq)
+            SELECT name, 1 FROM incoming_changes
+            ON CONFLICT (name) DO UPDATE SET seq = seq + 1;
+            """
+        )
+        self.conn.execute(
+            """
+            INSERT INTO prompt_spec_versions (
+                name, version_seq, action,
+                description, provider, model, web_search, reasoning_effort, context_size,
+                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
+                version, enabled, aliases, source, checksum, token_limits, notes,
+                created_at, updated_at, occurred_at
+            )
+            SELECT
+                p.name, n.seq AS version_seq, c.action,
+                p.description, p.provider, p.model, p.web_search, p.reasoning_effort, p.context_size,
+                p.temperature, p.max_output_tokens, p.system_instruction, p.use_cases, p.parameters, p.tags,
+                p.version, p.enabled, p.aliases, p.source, p.checksum, p.token_limits, p.notes,
+                p.created_at, p.updated_at, current_timestamp AS occurred_at
+            FROM prompt_specs p
+            JOIN incoming_changes c USING (name)
+            JOIN prompt_spec_counters n USING (name);
+            """
+        )
+        counts = dict(
+            self.conn.execute("SELECT action, count(*) FROM incoming_changes GROUP BY action;").fetchall()
+        )
+        self.conn.execute("DROP TABLE IF EXISTS incoming_changes;")
+        self.conn.execute("DROP TABLE IF EXISTS incoming_specs;")
+        created, updated = counts.get("insert", 0), counts.get("update", 0)
+        logger.info(
+            "Bulk upserted prompt specs: created=%d updated=%d unchanged=%d",
+            created,
+            updated,
+            len(rows) - created - updated,
+        )
+        return created, updated
+
+    def _fetch_spec(self, statement: duckdb.Statement, params: Dict[str, Any]) -> Optional[PromptSpec]:
+        res = self.conn.execute(statement, params).fetchone()
+        return PromptSpec._from_row_tuple(res) if res is not None else None
 
     def get_by_name(self, name: str) -> Optional[PromptSpec]:
-        row = self._get_row(name)
-        return PromptSpec.from_row(row) if row else None
+        return self._fetch_spec(self._ps_get, {"name": name})
 
     def get_by_name_or_alias(self, name_or_alias: str) -> Optional[PromptSpec]:
         """Retrieve a prompt by its primary name or any alias.
 
-        Uses DuckDB's list_contains for alias lookup, safely handling NULLs.
+        Tries a primary-key probe on the name first, then resolves the alias through
+        the prompt_aliases table; only names found by neither scan the aliases column.
         """
-        cur = self.conn.execute(
-            (
-                """
-                SELECT * FROM prompt_specs
-                WHERE name = $name
-                   OR coalesce(list_contains(aliases, $name), FALSE)
-                LIMIT 1;
-                """
-            ),
-            {"name": name_or_alias},
-        )
-        res = cur.fetchone()
+        row = self.get_row_by_name_or_alias(name_or_alias)
+        return PromptSpec._from_row_tuple(row) if row is not None else None
+
+    def get_row_by_name_or_alias(self, name_or_alias: str) -> Optional[Tuple[Any, ...]]:
+        """Like ``get_by_name_or_alias``, but return the raw row in ``SPEC_FIELDS`` order."""
+        return self._lookup(name_or_alias, self._ps_get, _SPEC_ALIASES_AT)
+
+    def _lookup(
+        self, name_or_alias: str, by_name: duckdb.Statement, aliases_at: int
+    ) -> Optional[Tuple[Any, ...]]:
+        """Resolve a name or alias to a row of ``by_name``, a primary-key probe on $name.
+
+        prompt_aliases is only a lookup index: its hit is accepted if the fetched row still
+        lists the alias. Otherwise the aliases column is scanned (e.g. after rows were
+        restored with plain SQL), preferring the most recently written prompt.
+        """
+        params = {"name": name_or_alias}
+        row = self.conn.execute(by_name, params).fetchone()
+        if row is not None:
+            return row
+        for resolve in (self._ps_alias_target, self._ps_alias_scan):
+            target = self.conn.execute(resolve, params).fetchone()
+            if target is None:
+                continue
+            row = self.conn.execute(by_name, {"name": target[0]}).fetchone()
+            if row is not None and name_or_alias in (row[aliases_at] or ()):
+                return row
+        return None
+
+    def get_system_instruction(self, name_or_alias: str) -> Optional[str]:
+        """Fetch only the system instruction for a name or alias, without building a PromptSpec."""
+        res = self._lookup(name_or_alias, self._ps_instruction, 1)
         if res is None:
             return None
-        col_names = [d[0] for d in cur.description]
-        return PromptSpec.from_row({k: v for k, v in zip(col_names, res)})
+        return res[0] or ""
+
+    def checksums(self) -> Dict[str, Optional[str]]:
+        """Return the stored checksum for every prompt, keyed by name."""
+        return dict(self.conn.execute(self._ps_checksums).fetchall())
 
     def list(self, enabled: Optional[bool] = None) -> List[PromptSpec]:
         if enabled is None:
-            cur = self.conn.execute("SELECT * FROM prompt_specs ORDER BY name;")
+            cur = self.conn.execute(self._ps_list)
         else:
-            cur = self.conn.execute(
-                "SELECT * FROM prompt_specs WHERE enabled = $enabled ORDER BY name;",
-                {"enabled": enabled},
-            )
-        col_names = [d[0] for d in cur.description]
-        return [PromptSpec.from_row({k: v for k, v in zip(col_names, row)}) for row in cur.fetchall()]
+            cur = self.conn.execute(self._ps_list_enabled, {"enabled": enabled})
+        return self._fetch_specs(cur)
 
-    def _next_version_seq(self, name: str) -> int:
-        cur = self.conn.execute(
-            "SELECT COALESCE(MAX(version_seq), 0) + 1 FROM prompt_spec_versions WHERE name = $name;",
-            {"name": name},
-        )
-        seq = cur.fetchone()[0]
-        try:
-            return int(seq)
-        except Exception:
-            return 1
+    def list_arrow(self, enabled: Optional[bool] = None) -> "pyarrow.Table":
+        """Return prompt specs as a pyarrow Table for bulk consumers (requires pyarrow)."""
+        if enabled is None:
+            cur = self.conn.execute(self._ps_list)
+        else:
+            cur = self.conn.execute(self._ps_list_enabled, {"enabled": enabled})
+        return cur.fetch_arrow_table()
+
+    def _fetch_specs(self, cur: duckdb.DuckDBPyConnection) -> List[PromptSpec]:
+        return [PromptSpec._from_row_tuple(row) for row in cur.fetchall()]
 
     def _insert_version_row(self, name: str, action: str) -> None:
-        version_seq = self._next_version_seq(name)
+        # A plain UPDATE, then an INSERT for names without a counter yet, measured several
+        # times faster than a single INSERT ... ON CONFLICT DO UPDATE.
+        res = self.conn.execute(self._ps_bump_seq, {"name": name}).fetchone()
+        if res is None:
+            res = self.conn.execute(self._ps_first_seq, {"name": name}).fetchone()
+        version_seq = res[0]
         logger.info(
             "Recording prompt spec version: name=%s seq=%s action=%s", name, version_seq, action
         )
         self.conn.execute(
-            """
-            INSERT INTO prompt_spec_versions (
-                name, version_seq, action,
-                description, provider, model, web_search, reasoning_effort, context_size,
-                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
-                version, enabled, aliases, source, checksum, token_limits, notes,
-                created_at, updated_at, occurred_at
-            )
-            SELECT
-                name, $version_seq AS version_seq, $action AS action,
-                description, provider, model, web_search, reasoning_effort, context_size,
-                temperature, max_output_tokens, system_instruction, use_cases, parameters, tags,
-                version, enabled, aliases, source, checksum, token_limits, notes,
-                created_at, updated_at, current_timestamp AS occurred_at
-            FROM prompt_specs
-            WHERE name = $name;
-            """,
+            self._ps_insert_version,
             {"name": name, "version_seq": version_seq, "action": action},
         )
 
@@ -160,7 +448,14 @@ class PromptRepository:
     ) -> List[PromptSpec]:
         conditions: List[str] = []
         params: Dict[str, Any] = {}
-        if query:
+        order_by = "updated_at DESC"
+        if query and self._ensure_fts_index():
+            # Qualified id: the fts macro's internal tables also have a "name" column.
+            score = "fts_main_prompt_specs.match_bm25(p.name, $q)"
+            conditions.append(f"{score} IS NOT NULL")
+            order_by = f"{score} DESC"
+            params["q"] = query
+        elif query:
             conditions.append(
                 "(lower(name) LIKE lower($q) OR lower(description) LIKE lower($q) OR lower(system_instruction) LIKE lower($q))"
             )
@@ -174,8 +469,34 @@ class PromptRepository:
                 params[f"tag_{i}"] = tag
         where_clause = (" WHERE " + " AND ".join(conditions)) if conditions else ""
         cur = self.conn.execute(
-            f"SELECT * FROM prompt_specs{where_clause} ORDER BY updated_at DESC LIMIT $limit;",
+            f"SELECT {_SPEC_SELECT} FROM prompt_specs p{where_clause} ORDER BY {order_by} LIMIT $limit;",
             {**params, "limit": limit},
         )
-        col_names = [d[0] for d in cur.description]
-        return [PromptSpec.from_row({k: v for k, v in zip(col_names, row)}) for row in cur.fetchall()]
+        return self._fetch_specs(cur)
+
+    def _ensure_fts_index(self) -> bool:
+        """Build or refresh the BM25 index over name/description/system_instruction if needed.
+
+        Staleness is tracked in the database (write revision, row count and latest
+        ``updated_at`` at build time), so writes from any connection or process are picked up. Returns False when
+        the index is unavailable or cannot be rebuilt (e.g. read-only database).
+        """
+        if self._fts_available is None:
+            self._fts_available = load_fts(self.conn)
+        if not self._fts_available:
+            return False
+        source_state = self.conn.execute(self._ps_fts_source_state).fetchone()
+        if self.conn.execute(self._ps_fts_built_state).fetchone() == source_state:
+            return True
+        try:
+            logger.debug("Rebuilding full-text index on prompt_specs")
+            self.conn.execute(
+                "PRAGMA create_fts_index('prompt_specs', 'name', 'name', 'description', "
+                "'system_instruction', overwrite=1);"
+            )
+            self.conn.execute("DELETE FROM prompt_fts_state;")
+            self.conn.execute("INSERT INTO prompt_fts_state VALUES (?, ?, ?);", source_state)
+        except duckdb.Error as exc:
+            logger.info("Cannot rebuild full-text index, text search falls back to LIKE: %s", exc)
+            return False
+        return True
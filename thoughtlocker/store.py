@@ -1,17 +1,26 @@
+import functools
 import logging
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 import duckdb
 
-from .db import get_connection, ensure_schema, transaction
+if TYPE_CHECKING:
+    import pyarrow
+
+from .db import get_connection, ensure_schema, release_connection, transaction
 from .models import PromptSpec
 from .repository import PromptRepository
-from .loader import load_yaml_to_specs
+from .loader import load_yaml_to_specs, seed_specs
 
 
 logger = logging.getLogger(__name__)
 
 
+def _spec_from_cached_row(row: Tuple[Any, ...]) -> PromptSpec:
+    # Cached rows are shared between calls; give every caller its own spec and lists.
+    return PromptSpec._from_row_tuple(tuple(list(v) if isinstance(v, list) else v for v in row))
+
+
 class Locker:
     """
     High-level, importable API for prompt management.
@@ -20,18 +29,37 @@ class Locker:
     for use within multi-agent LLM systems.
     """
 
-    def __init__(self, db_path: str = "prompts.duckdb"):
+    def __init__(self, db_path: str = "prompts.duckdb", cache_size: int = 1024):
         self._db_path: str = db_path
         self._conn: duckdb.DuckDBPyConnection = get_connection(db_path)
+        self._closed = False
         ensure_schema(self._conn)
         self._repo: PromptRepository = PromptRepository(self._conn)
+        # Per-instance LRU over name/alias lookups; cleared on every write through this Locker.
+        # Writes made by other connections are not observed until the cache is cleared.
+        # Rows are cached rather than PromptSpecs, so callers can't mutate each other's results.
+        self._get_cached = functools.lru_cache(maxsize=cache_size)(
+            self._repo.get_row_by_name_or_alias
+        )
+        self._instruction_cached = functools.lru_cache(maxsize=cache_size)(
+            self._repo.get_system_instruction
+        )
 
     # ---------- lifecycle ----------
     def close(self) -> None:
+        """Close this Locker's cursor and release the database file if no one else uses it."""
+        if self._closed:
+            return
+        self._closed = True
         try:
             self._conn.close()
         except Exception as exc:
             logger.warning("Error closing DuckDB connection: %s", exc)
+        release_connection(self._db_path)
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return a new cursor on this Locker's database for use from another thread."""
+        return self._conn.cursor()
 
     def __enter__(self) -> "Locker":
         return self
@@ -41,21 +69,29 @@ class Locker:
 
     # ---------- retrieval ----------
     def get(self, name_or_alias: str) -> PromptSpec:
-        spec = self._repo.get_by_name_or_alias(name_or_alias)
-        if spec is None:
+        row = self._get_cached(name_or_alias)
+        if row is None:
             raise KeyError(f"Prompt spec not found: {name_or_alias}")
-        return spec
+        return _spec_from_cached_row(row)
 
     def try_get(self, name_or_alias: str) -> Optional[PromptSpec]:
-        return self._repo.get_by_name_or_alias(name_or_alias)
+        row = self._get_cached(name_or_alias)
+        return _spec_from_cached_row(row) if row is not None else None
 
     def get_system_instruction(self, name_or_alias: str) -> str:
-        return self.get(name_or_alias).system_instruction
+        instruction = self._instruction_cached(name_or_alias)
+        if instruction is None:
+            raise KeyError(f"Prompt spec not found: {name_or_alias}")
+        return instruction
 
     # ---------- listing/search ----------
     def list(self, enabled: Optional[bool] = None) -> List[PromptSpec]:
         return self._repo.list(enabled=enabled)
 
+    def list_arrow(self, enabled: Optional[bool] = None) -> "pyarrow.Table":
+        """Columnar listing for bulk consumers that don't need PromptSpec objects."""
+        return self._repo.list_arrow(enabled=enabled)
+
     def search(
         self,
         query: Optional[str] = None,
@@ -65,16 +101,21 @@ class Locker:
     ) -> List[PromptSpec]:
         return self._repo.search(query=query, tags=tags, provider=provider, limit=limit)
 
+    def clear_cache(self) -> None:
+        """Drop memoized lookups, e.g. after the database was changed elsewhere."""
+        self._get_cached.cache_clear()
+        self._instruction_cached.cache_clear()
+
     # ---------- mutation ----------
     def upsert(self, spec: PromptSpec) -> None:
         with transaction(self._conn):
             self._repo.upsert(spec)
-
-    def seed_from_yaml(self, yaml_path: str) -> None:
-        """Load prompt specs from YAML and upsert them transactionally."""
-        specs = load_yaml_to_specs(yaml_path)
-        with transaction(self._conn):
-            for spec in specs:
-                self._repo.upsert(spec)
-
-
+        self.clear_cache()
+
+    def seed_from_yaml(self, yaml_path: str, batch_size: int = 256) -> None:
+        """Stream prompt specs from YAML and upsert changed ones in batches, in one transaction."""
+        created, updated = seed_specs(
+            self._conn, self._repo, load_yaml_to_specs(yaml_path), batch_size=batch_size
+        )
+        if created or updated:
+            self.clear_cache()